@@ -78,10 +78,7 @@ ON
 GROUP BY
   month,
   rx.bnf_code,
-  bnf_name
-ORDER BY
-  bnf_code,
-  month ;
+  bnf_name ;
   
   --this is the main query
   
@@ -157,11 +154,12 @@ ncso_sum_df['perc_difference'] = ncso_sum_df['difference'] / ncso_sum_df['actual
 ncso_sum_df.sort_values(by=['rx_month']) #sort values by month for chart
 
 ncso_sum_df.reset_index(inplace=True)
+month_labels = ncso_sum_df['rx_month'].dt.strftime("%b %Y") #this formats date as string for the x axis of all charts below, formats here: https://www.ibm.com/support/knowledgecenter/SS6V3G_5.3.1/com.ibm.help.gswapplintug.doc/GSW_strdate.html
 
 # ### What is the accuracy of the Price Concessions tool?
 
 ax = ncso_sum_df.plot.bar(figsize = (12,6), y= ['perc_difference'], legend=None)
-ax.xaxis.set_major_formatter(plt.FixedFormatter(ncso_sum_df['rx_month'].dt.strftime("%b %Y"))) #this formats date as string in desired format for x axis, formats here: https://www.ibm.com/support/knowledgecenter/SS6V3G_5.3.1/com.ibm.help.gswapplintug.doc/GSW_strdate.html
+ax.xaxis.set_major_formatter(plt.FixedFormatter(month_labels))
 ax.yaxis.set_major_formatter(ticker.PercentFormatter(1, decimals=None)) ##sets y axis labels as percent (and formats correctly i.e. x100)
 ax.set_title('Percentage difference between forecasted price concession costs and actual spend')
 
@@ -173,7 +171,7 @@ ncso_sum_df['difference_rolling'] = ncso_sum_df['predicted_cost_rolling'] - ncso
 ncso_sum_df['perc_difference_rolling'] = ncso_sum_df['difference_rolling'] / ncso_sum_df['actual_cost'] #calculate percentage difference on 3 month rolling
 
 ax = ncso_sum_df.plot.bar(figsize = (12,6), y=['perc_difference', 'perc_difference_rolling'])
-ax.xaxis.set_major_formatter(plt.FixedFormatter(ncso_sum_df['rx_month'].dt.strftime("%b %Y"))) #this formats date as string in desired format for x axis, formats here: https://www.ibm.com/support/knowledgecenter/SS6V3G_5.3.1/com.ibm.help.gswapplintug.doc/GSW_strdate.html
+ax.xaxis.set_major_formatter(plt.FixedFormatter(month_labels))
 ax.yaxis.set_major_formatter(ticker.PercentFormatter(1, decimals=None)) ##sets y axis labels as percent (and formats correctly i.e. x100)
 ax.set_title('Percentage difference between forecasted price concession costs, \nrolling 3 month average forecast and actual spend')
 ax.legend(["Single month forecast", "Rolling 3 month forecast"])
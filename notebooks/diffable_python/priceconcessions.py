@@ -64,10 +64,7 @@ ON
 GROUP BY
   month,
   rx.bnf_code,
-  bnf_name
-ORDER BY
-  bnf_code,
-  month ;
+  bnf_name ;
   
   --this is the main query
   
@@ -163,9 +160,10 @@ ncso_sum_df['perc_difference'] = ncso_sum_df['difference'] / ncso_sum_df['actual
 ncso_sum_df.sort_values(by=['rx_month']) #sort values by month for chart
 
 ncso_sum_df.reset_index(inplace=True)
+month_labels = ncso_sum_df['rx_month'].dt.strftime("%b %Y") #this formats date as string for the x axis of all charts below, formats here: https://www.ibm.com/support/knowledgecenter/SS6V3G_5.3.1/com.ibm.help.gswapplintug.doc/GSW_strdate.html
 
 ax = ncso_sum_df.plot.bar(figsize = (12,6), y= ['perc_difference'], legend=None)
-ax.xaxis.set_major_formatter(plt.FixedFormatter(ncso_sum_df['rx_month'].dt.strftime("%b %Y"))) #this formats date as string in desired format for x axis, formats here: https://www.ibm.com/support/knowledgecenter/SS6V3G_5.3.1/com.ibm.help.gswapplintug.doc/GSW_strdate.html
+ax.xaxis.set_major_formatter(plt.FixedFormatter(month_labels))
 ax.yaxis.set_major_formatter(ticker.PercentFormatter(1, decimals=None)) ##sets y axis labels as percent (and formats correctly i.e. x100)
 ax.set_title('Percentage difference between forecasted price concession costs and actual spend')
 
@@ -175,7 +173,7 @@ ncso_sum_df['difference_rolling'] = ncso_sum_df['predicted_cost_rolling'] - ncso
 ncso_sum_df['perc_difference_rolling'] = ncso_sum_df['difference_rolling'] / ncso_sum_df['actual_cost'] #calculate percentage difference on 3 month rolling
 
 ax = ncso_sum_df.plot.bar(figsize = (12,6), y=['perc_difference', 'perc_difference_rolling'])
-ax.xaxis.set_major_formatter(plt.FixedFormatter(ncso_sum_df['rx_month'].dt.strftime("%b %Y"))) #this formats date as string in desired format for x axis, formats here: https://www.ibm.com/support/knowledgecenter/SS6V3G_5.3.1/com.ibm.help.gswapplintug.doc/GSW_strdate.html
+ax.xaxis.set_major_formatter(plt.FixedFormatter(month_labels))
 ax.yaxis.set_major_formatter(ticker.PercentFormatter(1, decimals=None)) ##sets y axis labels as percent (and formats correctly i.e. x100)
 ax.set_title('Percentage difference between forecasted price concession costs, \nrolling 3 month average forecast and actual spend')
 ax.legend(["Single month forecast", "Rolling 3 month forecast"])
@@ -197,21 +195,10 @@ bh2.head()
 
 ncso_dates_df=ncso_sum_df.reset_index()
 
-import calendar
 dates = ncso_dates_df[["rx_month"]].drop_duplicates()
 dates["rx_month"] = pd.to_datetime(dates["rx_month"])
-dates["year"] = dates["rx_month"].dt.year
-dates["mon"] = dates["rx_month"].dt.month
-d = []
-for row in dates.itertuples():
-    y = row.year
-    m = row.mon
-    day = calendar.monthrange(y,m)[1]
-    d.append(str(y)+"-"+str(m)+"-"+str(day))
-d = pd.Series(d, name="enddates")
-d = pd.to_datetime(d, format="%Y/%m/%d")
-begindates = pd.Series(dates["rx_month"]).values.astype('datetime64[D]')
-enddates = pd.Series(d).values.astype('datetime64[D]')
+begindates = dates["rx_month"].values.astype('datetime64[D]')
+enddates = (dates["rx_month"] + pd.offsets.MonthEnd(0)).values.astype('datetime64[D]') # last day of each month
 #######
 # find business days in month
 dates["bdays0"] = np.busday_count(begindates, enddates) # not excluding bank holidays
@@ -222,29 +209,35 @@ dates.set_index('rx_month')
 
 ncso_sum_df.reset_index()
 
-ncso_sum_df = pd.merge(ncso_sum_df, dates, on='rx_month')
+bdays_by_month = dates.set_index('rx_month').sort_index() #one row per month, so look business days up by month rather than merging
+ncso_sum_df['bdays0'] = ncso_sum_df['rx_month'].map(bdays_by_month['bdays0'])
+ncso_sum_df['bdays'] = ncso_sum_df['rx_month'].map(bdays_by_month['bdays'])
 
 dates.index = pd.to_datetime(dates.index)
 
 #dates['pred_month'] = dates.lookup(dates.index, dates['bdays'])
-ncso_sum_df['bdays2']=ncso_sum_df['bdays'].shift(2)
+ncso_sum_df['pred_month'] = ncso_sum_df['rx_month'] - pd.DateOffset(months=2) #prescribing month the prediction was based on
+ncso_sum_df['bdays2'] = ncso_sum_df['pred_month'].map(bdays_by_month['bdays']) #NaN where that month isn't in the data
 
 ncso_sum_df.head()
 
-ncso_sum_df['predicted_cost_work_days_adj']=(ncso_sum_df['bdays2']/ncso_sum_df['bdays'])*result['predicted_cost']
-ncso_sum_df['difference_work_day_adj']=ncso_sum_df['predicted_cost_work_days_adj']-ncso_sum_df['actual_cost']
-ncso_sum_df['percent_difference_work_days_adj']=ncso_sum_df['difference_work_day_adj']/ncso_sum_df['actual_cost']
+#adjust predicted cost by business days, then calculate difference and percentage difference to actual, in one pass
+ncso_sum_df = ncso_sum_df.eval('''
+predicted_cost_work_days_adj = (bdays2 / bdays) * predicted_cost
+difference_work_day_adj = predicted_cost_work_days_adj - actual_cost
+percent_difference_work_days_adj = difference_work_day_adj / actual_cost
+''')
 
 ax = ncso_sum_df.plot.bar(figsize = (12,6), x='rx_month', y='percent_difference_work_days_adj')
 
 ax = ncso_sum_df.plot.bar(figsize = (12,6), y=['perc_difference', 'perc_difference_rolling', 'percent_difference_work_days_adj'])
-ax.xaxis.set_major_formatter(plt.FixedFormatter(ncso_sum_df['rx_month'].dt.strftime("%b %Y"))) #this formats date as string in desired format for x axis, formats here: https://www.ibm.com/support/knowledgecenter/SS6V3G_5.3.1/com.ibm.help.gswapplintug.doc/GSW_strdate.html
+ax.xaxis.set_major_formatter(plt.FixedFormatter(month_labels))
 ax.yaxis.set_major_formatter(ticker.PercentFormatter(1, decimals=None)) ##sets y axis labels as percent (and formats correctly i.e. x100)
 #ax.set_title('Percentage difference between forecasted price concession costs, \nrolling 3 month average forecast and actual spend')
 #ax.legend(["Single month forecast", "Rolling 3 month forecast"])
 
 ncso_sum_df.head(25)
 
-result.describe()
+ncso_sum_df.describe()
 
 